@@ -173,10 +173,19 @@ def surrogate_loss(debug: bool=False) -> storch.Tensor:
             )
             new_parent.param_grads = parent.param_grads
             # Fake the new parent to be the old parent within the graph by mimicking its place in the graph
-            new_parent._parents = parent._parents
-            for p, has_link in new_parent._parents:
-                p._children.append((new_parent, has_link))
-            new_parent._children = parent._children
+            # Resolve the links of the old parent first, so that the copied links are known for the new parent too
+            parent._resolve_differentiable_links()
+            new_parent._parent_nodes = parent._parent_nodes.copy()
+            new_parent._parent_diff = bytearray(parent._parent_diff)
+            new_parent._parent_slots = []
+            for p, has_link in zip(
+                new_parent._parent_nodes, new_parent._parent_diff
+            ):
+                new_parent._parent_slots.append(len(p._child_nodes))
+                p._child_nodes.append(new_parent)
+                p._child_diff.append(has_link)
+            new_parent._child_nodes = parent._child_nodes
+            new_parent._child_diff = parent._child_diff
 
             # Compute the estimator
             (
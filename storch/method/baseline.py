@@ -1,5 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from typing import Optional
 import torch
 import storch
 from storch.tensor import StochasticTensor, CostTensor
@@ -20,18 +21,32 @@ class MovingAverageBaseline(Baseline):
 
     def __init__(self: MovingAverageBaseline, exponential_decay=0.95):
         super().__init__()
-        self.register_buffer("exponential_decay", torch.tensor(exponential_decay))
+        # The decay is a hyperparameter and not state, so it is kept as a float instead of a buffer
+        self.exponential_decay = float(exponential_decay)
         self.register_buffer("moving_average", torch.tensor(0.0))
 
     def compute_baseline(
         self, tensor: StochasticTensor, cost_node: CostTensor
     ) -> torch.Tensor:
-        avg_cost = storch.reduce_plates(cost_node).detach()
-        self.moving_average = (
-            self.exponential_decay * self.moving_average
-            + (1 - self.exponential_decay) * avg_cost
-        )._tensor
-        return self.moving_average
+        avg_cost = _reduce_scalar_cost(cost_node)
+        if avg_cost is None:
+            avg_cost = storch.reduce_plates(cost_node).detach()._tensor
+        moving_average = self.moving_average
+        dtype = torch.result_type(moving_average, avg_cost)
+        shape = torch.broadcast_shapes(moving_average.shape, avg_cost.shape)
+        if (
+            moving_average.device != avg_cost.device
+            or moving_average.dtype != dtype
+            or moving_average.shape != shape
+        ):
+            # The baseline can be created after the module was moved to a device, so move the buffer along with the
+            # costs as updating it out of place would do
+            moving_average = moving_average.to(avg_cost.device, dtype)
+            self.moving_average = moving_average.expand(shape).clone()
+        # Update the moving average in place to keep the registered buffer
+        _ema_update(self.moving_average, self.exponential_decay, avg_cost)
+        # Return a copy, as the returned baseline can be saved for the backward pass while the buffer is updated again
+        return self.moving_average.clone()
 
 
 class BatchAverageBaseline(Baseline):
@@ -48,7 +63,32 @@ class BatchAverageBaseline(Baseline):
                 "Can only use the batch average baseline if multiple samples are used."
             )
         costs = costs.detach()
-        sum_costs = storch.sum(costs, tensor.name)
+        dim = costs.get_plate_dim_index(tensor.name)
         # TODO: Should reduce correctly
-        baseline = (sum_costs - costs) / (tensor.n - 1)
+        baseline = _leave_one_out_mean(costs, dim, 1.0 / (tensor.n - 1))
         return baseline
+
+
+@storch.deterministic
+def _leave_one_out_mean(costs: torch.Tensor, dim: int, inv_n: float) -> torch.Tensor:
+    # Keep the reduced dimension so the sum broadcasts against costs without realigning the plates
+    return torch.sub(costs.sum(dim, keepdim=True), costs).mul_(inv_n)
+
+
+def _reduce_scalar_cost(cost_node: CostTensor) -> Optional[torch.Tensor]:
+    # Reducing plates of size 1 only multiplies with their weights, so skip the plate machinery for scalar costs
+    cost = cost_node._tensor
+    if cost.numel() != 1:
+        return None
+    avg_cost = cost.detach()
+    for plate in cost_node.plates:
+        if type(plate) is not storch.Plate or isinstance(plate.weight, storch.Tensor):
+            return None
+        avg_cost = avg_cost * plate.weight.detach()
+    return avg_cost
+
+
+def _ema_update(
+    moving_average: torch.Tensor, decay: float, value: torch.Tensor
+) -> torch.Tensor:
+    return moving_average.mul_(decay).add_(value, alpha=1.0 - decay)
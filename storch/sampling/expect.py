@@ -5,7 +5,7 @@ from torch.distributions import Distribution
 import storch
 import torch
 from storch import Plate
-import itertools
+from storch.util import index_grid
 
 
 class Enumerate(SamplingMethod):
@@ -52,17 +52,29 @@ class Enumerate(SamplingMethod):
             [amt_samples_used] + list(support.shape[1:])
         )
         support_non_expanded = support_non_expanded.squeeze().unsqueeze(1)
-        for i, t in enumerate(
-            itertools.product(support_non_expanded, repeat=cross_products)
-        ):
-            enumerate_tensor[i] = torch.cat(t, dim=0)
+        # Gather all cross products of the support at once instead of concatenating them one by one
+        indices = index_grid(
+            [support_non_expanded.shape[0]] * cross_products, support.device
+        )
+        cross_support = support_non_expanded[indices].flatten(1, 2)
+        # Align each row with the rows of enumerate_tensor as assigning the rows one by one would do: drop leading
+        # singleton dimensions of rows with too many dimensions and prepend singleton dimensions to rows with too few
+        row_shape = cross_support.shape[1:]
+        while len(row_shape) >= enumerate_tensor.dim() and row_shape[0] == 1:
+            row_shape = row_shape[1:]
+        cross_support = cross_support.reshape(
+            (cross_support.shape[0],)
+            + (1,) * (enumerate_tensor.dim() - 1 - len(row_shape))
+            + row_shape
+        )
+        enumerate_tensor[: cross_support.shape[0]] = cross_support
 
         enumerate_tensor = enumerate_tensor.detach()
 
         plate_size = enumerate_tensor.shape[0]
 
         plate = Plate(self.plate_name, plate_size, plates.copy())
-        plates.insert(0, plate)
+        plates = [plate] + plates
 
         s_tensor = storch.StochasticTensor(
             enumerate_tensor,
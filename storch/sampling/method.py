@@ -136,7 +136,7 @@ class MonteCarlo(SamplingMethod):
 
         if not plate:
             plate = Plate(self.plate_name, plate_size, plates.copy())
-            plates.insert(0, plate)
+            plates = [plate] + plates
 
         if isinstance(tensor, storch.Tensor):
             tensor = tensor._tensor
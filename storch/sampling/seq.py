@@ -208,10 +208,11 @@ class SequenceDecoding(SamplingMethod):
             self.finished_samples = samples.eq(self.eos)
 
         k_index = 0
-        plates = orig_distr_plates
+        # Copy the plates, as they are changed below and belong to the caller or to the samples tensor
+        plates = orig_distr_plates.copy()
         if isinstance(samples, storch.Tensor):
             k_index = samples.plate_dims
-            plates = samples.plates
+            plates = samples.plates.copy()
             samples = samples._tensor
 
         plate_size = samples.shape[k_index]
@@ -230,7 +231,9 @@ class SequenceDecoding(SamplingMethod):
         plates.append(self.new_plate)
 
         if self.parent_indexing is not None:
-            self.parent_indexing.plates.append(self.new_plate)
+            self.parent_indexing._set_plates(
+                self.parent_indexing.plates + [self.new_plate]
+            )
 
         self.seq = list(map(lambda t: self.new_plate.on_unwrap_tensor(t), self.seq))
 
@@ -449,15 +452,20 @@ class IterDecoding(SequenceDecoding):
             # Permute the dimensions of d_log_probs st the k dimension is after the plates.
             for i, plate in enumerate(d_log_probs.multi_dim_plates()):
                 if plate.name == self.plate_name:
-                    d_log_probs.plates.remove(plate)
+                    new_plates = d_log_probs.plates.copy()
+                    new_plates.remove(plate)
+                    d_log_probs._set_plates(new_plates)
                     # distr_plates x k x |D_yv| x events
-                    d_log_probs._tensor = d_log_probs._tensor.permute(
-                        tuple(range(0, i))
-                        + tuple(range(i + 1, amt_multi_dim_orig_distr_plates))
-                        + (i,)
-                        + tuple(
-                            range(
-                                amt_multi_dim_orig_distr_plates, len(d_log_probs.shape)
+                    d_log_probs._set_tensor(
+                        d_log_probs._tensor.permute(
+                            tuple(range(0, i))
+                            + tuple(range(i + 1, amt_multi_dim_orig_distr_plates))
+                            + (i,)
+                            + tuple(
+                                range(
+                                    amt_multi_dim_orig_distr_plates,
+                                    len(d_log_probs.shape),
+                                )
                             )
                         )
                     )
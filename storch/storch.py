@@ -198,14 +198,21 @@ def variance(
             "Should pass a variance_plate that is included in the passed plates."
         )
     mean = variance_plate.reduce(tensor, detach_weights=detach_weights)
-    variance = (tensor - mean) ** 2
-
-    event_dims = tensor.event_dim_indices
-    if len(event_dims) > 0:
-        variance = variance.sum(tensor.event_dim_indices)
+    variance = _squared_error(tensor, mean, tensor.event_dims)
     return reduce_plates(variance, detach_weights=detach_weights)
 
 
+@storch.deterministic
+def _squared_error(
+    tensor: torch.Tensor, mean: torch.Tensor, event_dims: int
+) -> torch.Tensor:
+    # Square the difference in place and sum out the (rightmost) event dimensions in the same deterministic call
+    squared_error = torch.sub(tensor, mean).pow_(2)
+    if event_dims > 0:
+        squared_error = squared_error.sum(tuple(range(-event_dims, 0)))
+    return squared_error
+
+
 def grad(
     outputs,
     inputs,
@@ -3,7 +3,7 @@ import torch
 import storch
 from torch.distributions import Distribution
 from collections import deque
-from typing import List, Iterable, Any, Callable, Iterator, Dict
+from typing import List, Iterable, Any, Callable, Iterator, Dict, Tuple
 import builtins
 from itertools import product
 from typing import Optional
@@ -15,6 +15,12 @@ from storch.excluded_init import (
     expand_methods,
 )
 
+# Types of the Python numbers that operators with a Tensor handle directly. See _fast_binop
+_number_types = (int, float, bool)
+
+# Value in _parent_diff and _child_diff for links of which it is not known yet whether they are differentiable
+_LINK_UNKNOWN = 2
+
 # from storch.typing import BatchTensor
 
 
@@ -213,21 +219,59 @@ class Tensor:
             batch_dims += 1
 
         self._name = name
-        self._tensor = tensor
-        self._parents = []
+        # The links in the graph are stored as parallel lists of nodes and whether the link is differentiable
+        self._parent_nodes = []
+        self._parent_diff = bytearray()
+        # The index of this Tensor in the children of each parent
+        self._parent_slots = []
+        # The tensors and gradient functions of the parents when the links were created. The links are resolved
+        # against these, as the parents can be changed in place before the links are resolved.
+        self._parent_tensors = []
+        self._parent_grad_fns = []
         self._cleaned = False
-        differentiable_links = has_backwards_path(self, parents)
-        for i, p in enumerate(parents):
+        for p in parents:
             # TODO: Should I re-add this?
             # if p.is_cost:
             #     raise ValueError("Cost nodes cannot have children.")
-            self._parents.append((p, differentiable_links[i]))
-            p._children.append((self, differentiable_links[i]))
-        self._children = []
+            # Whether the link is differentiable is only computed when it is needed. See _resolve_differentiable_links
+            self._parent_nodes.append(p)
+            self._parent_diff.append(_LINK_UNKNOWN)
+            self._parent_slots.append(len(p._child_nodes))
+            self._parent_tensors.append(p._tensor)
+            self._parent_grad_fns.append(p._tensor.grad_fn)
+            p._child_nodes.append(self)
+            p._child_diff.append(_LINK_UNKNOWN)
+        self._child_nodes = []
+        self._child_diff = bytearray()
         self.plate_dims = batch_dims
-        self.event_shape = tensor.shape[batch_dims:]
+        self._set_tensor(tensor)
+        self._set_plates(plates)
+
+    def _set_tensor(self, tensor: torch.Tensor):
+        """
+        Sets the wrapped tensor, and caches its shape. Use this instead of assigning :attr:`_tensor` directly, and call
+        it again when the wrapped tensor changes shape in place.
+        """
+        self._tensor = tensor
+        self._shape = tensor.size()
+        self._ndim = len(self._shape)
+        self._plate_shape = self._shape[: self.plate_dims]
+        self.event_shape = self._shape[self.plate_dims :]
         self.event_dims = len(self.event_shape)
-        self.plates = plates
+        self._event_dim_indices = tuple(range(self.plate_dims, self._ndim))
+
+    def _set_plates(self, plates: [Plate]):
+        """
+        Sets the plates of this Tensor, and the lookups of plates by name. Use this instead of changing
+        :attr:`plates` in place.
+        """
+        # Keep a copy, as the passed list can be shared with other tensors and would make the lookups stale if changed
+        self.plates = list(plates)
+        self._plates_by_name = {plate.name: plate for plate in plates}
+        self._multi_dim_plates = [plate for plate in plates if plate.n > 1]
+        self._plate_dim_index = {
+            plate.name: i for i, plate in enumerate(self._multi_dim_plates)
+        }
 
     def __torch_function__(self, func, types, args=(), kwargs=None):
         """
@@ -260,11 +304,13 @@ class Tensor:
         Called whenever an attribute is called on a storch.Tensor object that is not directly implemented by storch.Tensor.
         It defers it to the underlying torch.Tensor. If it is a callable (ie, torch.Tensor implements a function
         with the name item), it will wrap this callable with a deterministic wrapper.
+        Most methods of torch.Tensor are already set on storch.Tensor when this module is loaded (see the bottom of
+        this file), so this is only reached for the remaining attributes.
 
         TODO: This should probably filter the methods
         """
         attr = getattr(torch.Tensor, item)
-        if isinstance(attr, Callable):
+        if callable(attr):
             func_name = attr.__name__
             if func_name in exception_methods:
                 raise IllegalStorchExposeError(
@@ -323,22 +369,32 @@ class Tensor:
         only_differentiable=False,
         repeat_visited=False,
         walk_fn=lambda x: x,
+        is_differentiable=lambda v, w: _edge_differentiable(v, w),
     ) -> Iterator:
-        visited = set()
+        # Keyed by id to only use identity. Values keep the visited nodes alive during the walk, so ids are not reused.
+        visited = {}
         visited_ordered = []
         if depth_first:
             S = [self]
             while S:
                 v = S.pop()
-                if repeat_visited or v not in visited:
+                if repeat_visited or id(v) not in visited:
                     yield walk_fn(v)
-                    visited.add(v)
-                    for w, d in expand_fn(v):
-                        if d or not only_differentiable:
+                    visited[id(v)] = v
+                    for w, d in zip(*expand_fn(v)):
+                        # Skip nodes that are already visited, so shared subgraphs do not grow the stack
+                        if (repeat_visited or id(w) not in visited) and (
+                            not only_differentiable
+                            or (
+                                d == 1
+                                if d != _LINK_UNKNOWN
+                                else is_differentiable(v, w)
+                            )
+                        ):
                             S.append(w)
         else:
             queue = deque()
-            visited.add(self)
+            visited[id(self)] = self
             queue.append(self)
             while queue:
                 v = queue.popleft()
@@ -346,14 +402,18 @@ class Tensor:
                     visited_ordered.append(v)
                 else:
                     yield walk_fn(v)
-                for w, d in expand_fn(v):
-                    if (repeat_visited or w not in visited) and (
-                        d or not only_differentiable
+                for w, d in zip(*expand_fn(v)):
+                    if (repeat_visited or id(w) not in visited) and (
+                        not only_differentiable
+                        or (
+                            d == 1 if d != _LINK_UNKNOWN else is_differentiable(v, w)
+                        )
                     ):
-                        visited.add(w)
+                        visited[id(w)] = w
                         queue.append(w)
             if reverse:
-                return reversed(visited_ordered)
+                # A generator cannot return the reversed nodes, so yield them
+                yield from map(walk_fn, reversed(visited_ordered))
 
     def walk_parents(
         self,
@@ -379,11 +439,12 @@ class Tensor:
             Iterator of type that is equal to the output type of ``walk_fn``.
         """
         return self._walk_backwards(
-            lambda p: p._parents,
-            depth_first,
-            only_differentiable,
-            repeat_visited,
-            walk_fn,
+            lambda p: (p._parent_nodes, p._parent_diff),
+            depth_first=depth_first,
+            reverse=reverse,
+            only_differentiable=only_differentiable,
+            repeat_visited=repeat_visited,
+            walk_fn=walk_fn,
         )
 
     def walk_children(
@@ -406,26 +467,49 @@ class Tensor:
             Iterator of type that is equal to the output type of ``walk_fn``.
         """
         return self._walk_backwards(
-            lambda p: p._children,
-            depth_first,
-            only_differentiable,
-            repeat_visited,
-            walk_fn,
+            lambda p: (p._child_nodes, p._child_diff),
+            depth_first=depth_first,
+            only_differentiable=only_differentiable,
+            repeat_visited=repeat_visited,
+            walk_fn=walk_fn,
+            is_differentiable=lambda v, w: _edge_differentiable(w, v),
+        )
+
+    def _resolve_differentiable_links(self):
+        """
+        Computes whether the links to the parents of this Tensor are differentiable, if this is not known yet.
+        The result is stored in :attr:`_parent_diff` and in the :attr:`_child_diff` of the parents.
+        """
+        if _LINK_UNKNOWN not in self._parent_diff:
+            return
+        differentiable_links = has_backwards_path(
+            self, self._parent_tensors, self._parent_grad_fns
         )
+        for i, p in enumerate(self._parent_nodes):
+            self._parent_diff[i] = differentiable_links[i]
+            p._child_diff[self._parent_slots[i]] = differentiable_links[i]
+        # The links are known now, so the parents' graphs no longer have to be kept alive
+        self._parent_tensors = []
+        self._parent_grad_fns = []
 
     def _clean(self):
         """
-        Cleans up :attr:`_children` and :attr:`_parents` for all nodes in the subgraph of this node (depth first)
+        Cleans up the links to the children and parents for all nodes in the subgraph of this node (depth first)
         """
         if self._cleaned:
             return
         self._cleaned = True
-        for (node, _) in self._children:
+        for node in self._child_nodes:
             node._clean()
-        for (node, _) in self._parents:
+        for node in self._parent_nodes:
             node._clean()
-        self._children = []
-        self._parents = []
+        self._child_nodes = []
+        self._child_diff = bytearray()
+        self._parent_nodes = []
+        self._parent_diff = bytearray()
+        self._parent_slots = []
+        self._parent_tensors = []
+        self._parent_grad_fns = []
 
     def detach_tensor(self) -> storch.Tensor:
         """
@@ -456,14 +540,16 @@ class Tensor:
 
     @property
     def plate_shape(self) -> torch.Size:
-        return self._tensor.shape[: self.plate_dims]
+        return self._plate_shape
 
     def size(self, *args) -> torch.Size:
+        if not args:
+            return self._shape
         return self._tensor.size(*args)
 
     @property
     def shape(self) -> torch.Size:
-        return self._tensor.size()
+        return self._shape
 
     def is_cuda(self):
         return self._tensor.is_cuda
@@ -485,44 +571,53 @@ class Tensor:
         return self._tensor.grad
 
     def dim(self):
-        return self._tensor.dim()
+        return self._ndim
 
     def ndimension(self):
-        return self._tensor.ndimension()
+        return self._ndim
 
     @property
     def ndim(self):
-        return self._tensor.ndim
+        return self._ndim
 
     def register_hook(self, hook: Callable) -> Any:
         return self._tensor.register_hook(hook)
 
     @property
-    def event_dim_indices(self):
-        return range(self.plate_dims, self._tensor.dim())
+    def event_dim_indices(self) -> Tuple[int, ...]:
+        return self._event_dim_indices
 
     def get_plate(self, plate_name: str) -> Plate:
-        for plate in self.plates:
-            if plate.name == plate_name:
-                return plate
+        plate = self._plates_by_name.get(plate_name)
+        if plate is not None:
+            return plate
         raise IndexError("Tensor has no such plate: " + plate_name + ".")
 
     def get_plate_dim_index(self, plate_name: str) -> int:
-        for i, plate in enumerate(self.multi_dim_plates()):
-            if plate.name == plate_name:
-                return i
+        index = self._plate_dim_index.get(plate_name)
+        if index is not None:
+            return index
         raise IndexError(
             "Tensor has no such plate: "
             + plate_name
             + ". Alternatively, the dimension of this batch is 1."
         )
 
+    def plate_index_grid(self) -> torch.Tensor:
+        """
+        Returns:
+            torch.Tensor: A long tensor of shape (prod(plate_shape), plate_dims) containing all indices of the plate
+            dimensions, in the same order as :meth:`iterate_plate_indices`. It can be used to index the tensor in one go.
+        """
+        return storch.util.index_grid(self.plate_shape, self._tensor.device)
+
     def iterate_plate_indices(self) -> Iterable[List[int]]:
-        ranges = list(map(lambda a: list(range(a)), self.plate_shape))
-        return product(*ranges)
+        # Iterate on the host, as building the grid on the device of the tensor would have to sync to yield tuples
+        return product(*map(range, self.plate_shape))
 
     def multi_dim_plates(self) -> List[Plate]:
-        return list(filter(lambda p: p.n > 1, self.plates))
+        # Callers are allowed to change the returned list
+        return self._multi_dim_plates.copy()
 
     def backward(
         self,
@@ -618,22 +713,22 @@ class Tensor:
         raise NotImplementedError("In place detach is not allowed on storch tensors.")
 
     def __add__(self, other):
-        return torch.add(self, other)
+        return _fast_binop(torch.add, self, other)
 
     def __radd__(self, other):
-        return torch.add(other, self)
+        return _fast_binop(torch.add, other, self)
 
     def __sub__(self, other):
-        return torch.sub(self, other)
+        return _fast_binop(torch.sub, self, other)
 
     def __rsub__(self, other):
-        return torch.sub(other, self)
+        return _fast_binop(torch.sub, other, self)
 
     def __mul__(self, other):
-        return torch.mul(self, other)
+        return _fast_binop(torch.mul, self, other)
 
     def __rmul__(self, other):
-        return torch.mul(other, self)
+        return _fast_binop(torch.mul, other, self)
 
     def __matmul__(self, other):
         return torch.matmul(self, other)
@@ -642,34 +737,34 @@ class Tensor:
         return torch.matmul(other, self)
 
     def __pow__(self, other):
-        return torch.pow(self, other)
+        return _fast_binop(torch.pow, self, other)
 
     def __rpow__(self, other):
-        return torch.pow(other, self)
+        return _fast_binop(torch.pow, other, self)
 
     def __div__(self, other):
-        return torch.div(self, other)
+        return _fast_binop(torch.div, self, other)
 
     def __rdiv__(self, other):
-        return torch.div(other, self)
+        return _fast_binop(torch.div, other, self)
 
     def __mod__(self, other):
-        return torch.remainder(self, other)
+        return _fast_binop(torch.remainder, self, other)
 
     def __rmod__(self, other):
-        return torch.remainder(other, self)
+        return _fast_binop(torch.remainder, other, self)
 
     def __truediv__(self, other):
-        return torch.true_divide(self, other)
+        return _fast_binop(torch.true_divide, self, other)
 
     def __rtruediv__(self, other):
-        return torch.true_divide(other, self)
+        return _fast_binop(torch.true_divide, other, self)
 
     def __floordiv__(self, other):
-        return torch.floor_divide(self, other)
+        return _fast_binop(torch.floor_divide, self, other)
 
     def __rfloordiv__(self, other):
-        return torch.floor_divide(other, self)
+        return _fast_binop(torch.floor_divide, other, self)
 
     def __abs__(self):
         return torch.abs(self)
@@ -681,17 +776,17 @@ class Tensor:
         return torch.logical_and(other, self)
 
     def __ge__(self, other):
-        return torch.ge(self, other)
+        return _fast_binop(torch.ge, self, other)
 
     def __gt__(self, other):
-        return torch.gt(self, other)
+        return _fast_binop(torch.gt, self, other)
 
     @storch.deterministic
     def __invert__(self):
         return self.__invert__()
 
     def __le__(self, other):
-        return torch.le(self, other)
+        return _fast_binop(torch.le, self, other)
 
     @storch.deterministic
     def __lshift__(self, other):
@@ -702,10 +797,10 @@ class Tensor:
         return other.__lshift__(self)
 
     def __lt__(self, other):
-        return torch.lt(self, other)
+        return _fast_binop(torch.lt, self, other)
 
     def ne(self, other):
-        return torch.ne(self, other)
+        return _fast_binop(torch.ne, self, other)
 
     def __neg__(self):
         return torch.neg(self)
@@ -770,7 +865,8 @@ class IndependentTensor(Tensor):
                     + ". A parent sample has already used"
                     " this name. Use a different name for this independent dimension."
                 )
-        plates.insert(0, Plate(plate_name, n, plates.copy(), weight))
+        # Build a new list instead of inserting into the list that was passed by the caller
+        plates = [Plate(plate_name, n, plates.copy(), weight)] + plates
         super().__init__(tensor, parents, plates, tensor_name)
         self.n = n
 
@@ -845,5 +941,65 @@ class StochasticTensor(Tensor):
         super()._clean()
 
 
+def _wrap_torch_methods():
+    """
+    Sets a deterministic wrapper on :class:`Tensor` for every method of :class:`torch.Tensor` that is not implemented
+    by :class:`Tensor` itself. This way, calling these methods uses regular attribute lookup instead of going
+    through :meth:`Tensor.__getattr__`.
+    Magic methods, excluded methods and methods that raise an exception are left to :meth:`Tensor.__getattr__`.
+    """
+    for name in dir(torch.Tensor):
+        if name.startswith("__") or hasattr(Tensor, name):
+            continue
+        attr = getattr(torch.Tensor, name, None)
+        if not callable(attr):
+            continue
+        func_name = getattr(attr, "__name__", name)
+        if func_name in exception_methods or func_name in excluded_methods:
+            continue
+        setattr(Tensor, name, storch.wrappers._deterministic_method(name))
+
+
+_wrap_torch_methods()
+
+
+def _fast_binop(fn: Callable, a: Any, b: Any) -> Any:
+    """
+    Applies the binary torch function ``fn`` to ``a`` and ``b``, one of which is a :class:`Tensor`.
+    If the other argument is a Python number, this directly creates the output :class:`Tensor`, as there are no plates
+    to align and the only parent is the input. Otherwise, it defers to the deterministic wrapper.
+    """
+    if isinstance(a, Tensor):
+        tensor, other = a, b
+    else:
+        tensor, other = b, a
+    if (
+        type(other) not in _number_types
+        or storch.wrappers._context_stochastic
+        or storch.wrappers._ignore_wrap
+    ):
+        return fn(a, b)
+    for plate in tensor.plates:
+        # Subclasses of Plate can change the tensor when it is unwrapped
+        if type(plate) is not Plate:
+            return fn(a, b)
+    if tensor is a:
+        output = fn(tensor._tensor, other)
+    else:
+        output = fn(other, tensor._tensor)
+    return Tensor(output, [tensor], tensor.plates.copy(), name=fn.__name__ + "1")
+
+
+def _edge_differentiable(child: Tensor, parent: Tensor) -> bool:
+    """
+    Returns: True if the link from parent to child in the stochastic computation graph is differentiable.
+    """
+    child._resolve_differentiable_links()
+    for i, p in enumerate(child._parent_nodes):
+        if p is parent:
+            return child._parent_diff[i] == 1
+    return False
+
+
 is_tensor = lambda a: isinstance(a, torch.Tensor) or isinstance(a, Tensor)
 from storch.util import has_backwards_path
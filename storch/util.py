@@ -6,6 +6,7 @@ from pyro.distributions import (
     RelaxedBernoulliStraightThrough,
 )
 
+import storch
 from storch.tensor import Tensor, CostTensor, StochasticTensor, Plate, is_tensor
 from torch.distributions import (
     Distribution,
@@ -59,7 +60,8 @@ def print_graph(costs: [CostTensor]):
         print(name, node)
     for node in nodes:
         name = get_name(node, names)
-        for p, differentiable in node._parents:
+        node._resolve_differentiable_links()
+        for p, differentiable in zip(node._parent_nodes, node._parent_diff):
             edge = "-D->" if differentiable else "-X->"
             print(get_name(p, names) + edge + name)
 
@@ -70,20 +72,18 @@ def get_distr_parameters(
     params = {}
     while d:
         for k in d.arg_constraints:
-            try:
-                p = getattr(d, k)
-                if is_tensor(p) and (not filter_requires_grad or p.requires_grad):
-                    params[k] = p
-            except AttributeError:
-                from storch import _debug
-
-                if _debug:
+            # getattr with a default avoids raising and catching an AttributeError for missing parameters
+            p = getattr(d, k, None)
+            if p is None:
+                if storch._debug:
                     print(
                         "Attribute",
                         k,
                         "was not added because we could not get the attribute from the object.",
                     )
-                pass
+                continue
+            if is_tensor(p) and (not filter_requires_grad or p.requires_grad):
+                params[k] = p
         # Needed to be compatible with torch.Independent
         if hasattr(d, 'base_dist'):
             d = d.base_dist
@@ -110,13 +110,17 @@ def walk_backward_graph(tensor: torch.Tensor) -> Iterable[torch.Tensor]:
     return _walk_backward_graph(tensor.grad_fn)
 
 
-def has_backwards_path(output: Tensor, inputs: [Tensor]) -> [bool]:
+def has_backwards_path(
+    output: Tensor, inputs: [Tensor], grad_fns: Optional[list] = None
+) -> [bool]:
     """
     Returns true for each individual input if the gradient functions of the torch.Tensor underlying output is connected to the input tensor.
     This is only run once to compute the possibility of links between two storch.Tensor's. The result is saved into the
     parent links on storch.Tensor's.
     :param output:
     :param input:
+    :param grad_fns: Gradient functions of the inputs to search for instead of their current ones. Used when inputs
+    could have been changed in place since output was computed.
     :param depth_first: Initialized to False as we are usually doing this only for small distances between tensors.
     :return:
     """
@@ -130,29 +134,32 @@ def has_backwards_path(output: Tensor, inputs: [Tensor]) -> [bool]:
         params = get_distr_parameters(output.distribution).values()
         for param in params:
             # Run this function for each parameter and collect with or
-            has_paths = [a or b for (a, b) in zip(has_paths, has_backwards_path(param, inputs))]
+            has_paths = [a or b for (a, b) in zip(has_paths, has_backwards_path(param, inputs, grad_fns))]
         return has_paths
-    to_search = []
+    # Map the graph nodes of the inputs to their indices, so all inputs are found in a single walk over the graph.
+    # Leaf tensors are keyed on id as they appear as the variable of an AccumulateGrad node.
+    by_variable = {}
+    by_grad_fn = {}
     for i, input in enumerate(inputs):
         if isinstance(input, Tensor):
             input = input._tensor
         if output_t is input:
             # This can happen if the input is a parameter of the output distribution
             has_paths[i] = True
-        else:
-            to_search.append((i, input))
+            continue
+        by_variable.setdefault(id(input), []).append(i)
+        grad_fn = input.grad_fn if grad_fns is None else grad_fns[i]
+        if grad_fn:
+            by_grad_fn.setdefault(grad_fn, []).append(i)
+    if all(has_paths):
+        return has_paths
     for p in walk_backward_graph(output_t):
-        found_i = None
-        for j, (i, input) in enumerate(to_search):
-            if hasattr(p, "variable") and p.variable is input:
-                found_i = i
-                break
-            elif input.grad_fn and p is input.grad_fn:
-                found_i = i
-                break
-        if found_i:
-            del to_search[j]
-            has_paths[found_i] = True
+        found = by_grad_fn.pop(p, [])
+        if hasattr(p, "variable"):
+            found = found + by_variable.pop(id(p.variable), [])
+        if found:
+            for i in found:
+                has_paths[i] = True
             if all(has_paths):
                 # If we know all inputs are linked, we don't need to explore the rest of the computation graph
                 return has_paths
@@ -173,7 +180,7 @@ def topological_sort(costs: [CostTensor]) -> [Tensor]:
     :return:
     """
     for c in costs:
-        if not c.is_cost or c._children:
+        if not c.is_cost or c._child_nodes:
             raise ValueError(
                 "The inputs of the topological sort should only contain cost nodes."
             )
@@ -183,11 +190,11 @@ def topological_sort(costs: [CostTensor]) -> [Tensor]:
     while s:
         n = s.pop()
         l.append(n)
-        for (p, _) in n._parents:
+        for p in n._parent_nodes:
             if p in edges:
                 children = edges[p]
             else:
-                children = list(map(lambda ch: ch[0], p._children))
+                children = p._child_nodes.copy()
                 edges[p] = children
             c = -1
             for i, _c in enumerate(children):
@@ -210,6 +217,20 @@ def tensor_stats(tensor: torch.Tensor):
     )
 
 
+def index_grid(sizes: Iterable[int], device=None) -> torch.Tensor:
+    """
+    Returns all indices into a tensor with the given sizes as a long tensor of shape (prod(sizes), len(sizes)).
+    The rows are in the same order as itertools.product over the ranges of the sizes.
+    """
+    ranges = [torch.arange(n, device=device) for n in sizes]
+    if len(ranges) == 0:
+        return torch.zeros((1, 0), dtype=torch.long, device=device)
+    if len(ranges) == 1:
+        # cartesian_prod returns a 1D tensor for a single input
+        return ranges[0].unsqueeze(-1)
+    return torch.cartesian_prod(*ranges)
+
+
 def reduce_mean(tensor: torch.Tensor, keep_dims: [int]):
     if len(keep_dims) == tensor.ndim:
         return tensor
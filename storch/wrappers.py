@@ -361,6 +361,28 @@ def deterministic(fn: Optional[Callable] = None, **kwargs):
     return lambda _f: _deterministic(_f, **kwargs)
 
 
+def _deterministic_method(name: str):
+    """
+    Wraps the method of :class:`torch.Tensor` with the given name in a deterministic storch wrapper, so that it can be
+    set as a method on :class:`storch.Tensor`. The method is looked up on :class:`torch.Tensor` when it is called,
+    so that monkey patches applied after wrapping (see storch/__init__.py) are respected.
+    """
+
+    in_place = name.endswith("_")
+
+    @wraps(getattr(torch.Tensor, name))
+    def wrapper(*args, **kwargs):
+        if not in_place:
+            return _handle_deterministic(getattr(torch.Tensor, name), args, kwargs)
+        try:
+            return _handle_deterministic(getattr(torch.Tensor, name), args, kwargs)
+        finally:
+            # In-place methods such as unsqueeze_ can change the shape of the wrapped tensor, so refresh the cache
+            args[0]._set_tensor(args[0]._tensor)
+
+    return wrapper
+
+
 def reduce(fn, plates: Union[str, List[str]]):
     """
     Wraps the input function around a deterministic storch wrapper.
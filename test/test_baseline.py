@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+import pytest
+import torch
+import storch
+from storch.tensor import Plate
+from storch.method.baseline import (
+    MovingAverageBaseline,
+    BatchAverageBaseline,
+    _reduce_scalar_cost,
+)
+
+
+def test_moving_average_baseline():
+    baseline = MovingAverageBaseline(exponential_decay=0.9)
+    buffer = baseline.moving_average
+    expected = torch.tensor(0.0)
+    plate = Plate("z", 4, [])
+    for costs in torch.randn(5, 4):
+        cost = storch.CostTensor(costs, [], [plate], "cost")
+        result = baseline.compute_baseline(None, cost)
+        expected = 0.9 * expected + 0.1 * costs.mean()
+        assert torch.allclose(result, expected)
+        # The buffer is updated in place and the returned baseline is a copy of it
+        assert baseline.moving_average is buffer
+        assert result is not buffer
+    assert dict(baseline.named_buffers())["moving_average"] is buffer
+
+
+def test_moving_average_baseline_follows_costs():
+    baseline = MovingAverageBaseline(exponential_decay=0.9)
+    costs = torch.tensor([1.0, 2.0, 3.0], dtype=torch.float64)
+    result = baseline.compute_baseline(None, storch.CostTensor(costs, [], [], "cost"))
+    # The buffer is reallocated with the dtype and shape of the costs
+    assert result.dtype == torch.float64
+    assert torch.allclose(result, 0.1 * costs)
+    assert dict(baseline.named_buffers())["moving_average"] is baseline.moving_average
+    assert baseline.moving_average.shape == (3,)
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="Requires CUDA")
+def test_moving_average_baseline_device():
+    baseline = MovingAverageBaseline()
+    costs = torch.tensor([1.0, 2.0], device="cuda")
+    cost = storch.CostTensor(costs, [], [Plate("z", 2, [])], "cost")
+    baseline.compute_baseline(None, cost)
+    assert baseline.moving_average.device == costs.device
+
+
+class _SubPlate(Plate):
+    pass
+
+
+@pytest.mark.parametrize(
+    "plates,fallback",
+    [
+        ([], False),
+        ([Plate("z", 1, [])], False),
+        (
+            [
+                Plate("z", 1, [], torch.tensor(0.3)),
+                Plate("y", 1, [], torch.tensor(2.0)),
+            ],
+            False,
+        ),
+        ([_SubPlate("z", 1, [], torch.tensor(0.3))], True),
+        ([Plate("z", 1, [], storch.Tensor(torch.tensor(0.3), [], [], "w"))], True),
+    ],
+)
+def test_reduce_scalar_cost(plates, fallback):
+    cost = storch.CostTensor(torch.tensor(1.5), [], plates, "cost")
+    expected = storch.reduce_plates(cost).detach()._tensor
+    reduced = _reduce_scalar_cost(cost)
+    if fallback:
+        assert reduced is None
+    else:
+        assert torch.allclose(reduced, expected)
+    # Without decay, the moving average is the reduced cost of the last step
+    baseline = MovingAverageBaseline(exponential_decay=0.0)
+    assert torch.allclose(baseline.compute_baseline(None, cost), expected)
+
+
+def test_batch_average_baseline():
+    plates = [Plate("a", 2, []), Plate("z", 3, []), Plate("b", 4, [])]
+    costs = storch.CostTensor(torch.randn(2, 3, 4), [], plates, "cost")
+    # Only the name and the amount of samples of the sampled tensor are used
+    tensor = SimpleNamespace(name="z", n=3)
+    baseline = BatchAverageBaseline().compute_baseline(tensor, costs)
+    expected = (storch.sum(costs, "z") - costs) / 2
+    assert baseline.plates == costs.plates
+    # Subtracting aligns the plates, which are in a different order in expected
+    assert (baseline - expected)._tensor.abs().max() < 1e-6
@@ -0,0 +1,29 @@
+import itertools
+import pytest
+import torch
+import storch
+from torch.distributions import Bernoulli, Categorical, OneHotCategorical
+
+
+@pytest.mark.parametrize("batch_shape", [(), (2,), (1, 1)])
+@pytest.mark.parametrize(
+    "make_distr,support",
+    [
+        (lambda shape: Bernoulli(probs=torch.full(shape, 0.3)), torch.arange(2.0)),
+        (lambda shape: Categorical(logits=torch.zeros(*shape, 3)), torch.arange(3)),
+        (lambda shape: OneHotCategorical(logits=torch.zeros(*shape, 3)), torch.eye(3)),
+    ],
+    ids=["bernoulli", "categorical", "one_hot_categorical"],
+)
+def test_expect_enumerates_support(make_distr, support, batch_shape):
+    distr = make_distr(batch_shape)
+    z = storch.method.Expect("z")(distr)
+    n_events = int(torch.tensor(batch_shape).prod())
+    expected = torch.stack(
+        [
+            support[list(indices)].reshape(batch_shape + distr.event_shape)
+            for indices in itertools.product(range(len(support)), repeat=n_events)
+        ]
+    )
+    assert z._tensor.shape == expected.shape
+    assert (z._tensor == expected.to(z._tensor.dtype)).all()
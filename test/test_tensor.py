@@ -1,4 +1,5 @@
 from storch.tensor import Plate
+import itertools
 import pytest
 import torch
 import storch
@@ -115,3 +116,90 @@ def test_set_item_2(b, mask_b, value, expected):
     b = to_storch(b)
     b[mask_b] = value
     assert (b._tensor == expected).all()
+
+
+@pytest.mark.parametrize("plate_sizes", [[], [1], [4], [2, 1, 3], [2, 3, 4]])
+def test_plate_index_grid(plate_sizes):
+    plates = [Plate("p" + str(i), n, []) for i, n in enumerate(plate_sizes)]
+    plate_shape = [n for n in plate_sizes if n > 1]
+    t = storch.Tensor(torch.zeros(plate_shape + [2]), [], plates, "test")
+    grid = t.plate_index_grid()
+    expected = list(itertools.product(*map(range, plate_shape)))
+    assert grid.dtype == torch.long
+    assert grid.shape == (len(expected), len(plate_shape))
+    assert grid.tolist() == [list(indices) for indices in expected]
+    assert list(t.iterate_plate_indices()) == expected
+
+
+def test_scalar_binop(b):
+    plate = Plate("plate", 2, [])
+    t = storch.Tensor(b, [], [plate], "test")
+    for out, expected in [
+        (t + 1, b + 1),
+        (2 - t, 2 - b),
+        (t * 3.0, b * 3.0),
+        (1 / t, 1 / b),
+        (t ** 2, b ** 2),
+        (t < 0.3, b < 0.3),
+    ]:
+        assert isinstance(out, storch.Tensor)
+        assert out.plates == [plate]
+        assert out._parent_nodes[0] is t
+        assert (out._tensor == expected).all()
+
+
+def test_in_place_shape_change():
+    t = storch.Tensor(torch.zeros(3, 2), [], [Plate("a", 3, [])], "test")
+    t.unsqueeze_(1)
+    assert t.shape == t._tensor.shape == (3, 1, 2)
+    assert t.dim() == t.ndim == 3
+    assert t.event_dim_indices == (1, 2)
+    assert t.event_shape == (1, 2)
+    assert t.event_dims == 2
+    t.squeeze_(1)
+    assert t.shape == (3, 2)
+    assert t.plate_shape == (3,)
+
+
+def test_walk_only_differentiable():
+    a = storch.Tensor(torch.tensor(1.0, requires_grad=True), [], [], "a")
+    # The link from a to b is not differentiable
+    b = a.detach()
+    c = a * b
+
+    def ids(*tensors):
+        return list(map(id, tensors))
+
+    assert list(c.walk_parents(walk_fn=id)) == ids(c, b, a)
+    assert list(c.walk_parents(only_differentiable=True, walk_fn=id)) == ids(c, a)
+    assert list(c.walk_parents(depth_first=False, walk_fn=id)) == ids(c, a, b)
+    assert list(c.walk_parents(depth_first=False, reverse=True, walk_fn=id)) == ids(
+        b, a, c
+    )
+    assert list(a.walk_children(walk_fn=id)) == ids(a, c, b)
+    assert list(a.walk_children(only_differentiable=True, walk_fn=id)) == ids(a, c)
+    # Walking resolves the links of the children of a
+    assert list(a._child_diff) == [0, 1]
+
+
+def test_links_of_parents_changed_in_place():
+    x = torch.ones(2, requires_grad=True)
+    a = storch.Tensor(x * 2, [], [], "a")
+    c = storch.Tensor(x * 3, [], [], "c")
+    b = c * a
+    # Changing a in place replaces its grad_fn, but it was still used to compute b
+    a[0] = 5.0
+    b._resolve_differentiable_links()
+    assert list(b._parent_diff) == [1, 1]
+    assert list(a._child_diff) == [1]
+    assert list(c._child_diff) == [1]
+
+
+def test_plates_are_copied():
+    plates = [Plate("a", 3, []), Plate("b", 1, [])]
+    t = storch.Tensor(torch.zeros(3, 2), [], plates, "test")
+    plates.insert(0, Plate("c", 4, []))
+    assert [plate.name for plate in t.plates] == ["a", "b"]
+    assert t.get_plate_dim_index("a") == 0
+    with pytest.raises(IndexError):
+        t.get_plate("c")
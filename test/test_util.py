@@ -0,0 +1,20 @@
+import torch
+import storch
+from storch.util import has_backwards_path
+
+
+def test_has_backwards_path():
+    a = torch.tensor(1.0, requires_grad=True)
+    b = torch.tensor(2.0, requires_grad=True)
+    c = torch.tensor(3.0, requires_grad=True)
+    assert has_backwards_path(a * 2 + b, [a, b, c]) == [True, True, False]
+    assert has_backwards_path(b * 2, [a, b]) == [False, True]
+
+
+def test_has_backwards_path_shared_grad_fn():
+    a = torch.tensor(1.0, requires_grad=True)
+    x = a * 2
+    # Both inputs wrap the same tensor, so they share its grad_fn
+    inputs = [storch.Tensor(x, [], [], "x1"), storch.Tensor(x, [], [], "x2"), a]
+    assert has_backwards_path(x + 1, inputs) == [True, True, True]
+    assert has_backwards_path(a + 1, inputs) == [False, False, True]